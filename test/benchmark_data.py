@@ -0,0 +1,30 @@
+import time
+from bson import ObjectId
+from mongodb_data_generator import generate_batch_data
+from test_mongodb_order_performance import generate_order_data
+
+# Các benchmark ghi vào database riêng để không đụng vào dữ liệu của MyDatabase
+
+def generate_dataset(num_records, batch_size):
+    # Sinh dữ liệu một lần để mọi biến thể của benchmark ingest cùng một dataset
+    num_batches = max(1, num_records // batch_size)
+    product_ids = [{'_id': ObjectId()} for _ in range(1000)]
+
+    return {
+        'MyCollection': [generate_batch_data(batch_size) for _ in range(num_batches)],
+        'OrderCollection': [generate_order_data(batch_size, product_ids) for _ in range(num_batches)]
+    }
+
+def insert_batch(collection, batch):
+    # Copy vì insert_many gán _id vào chính document được truyền vào
+    collection.insert_many([dict(doc) for doc in batch], ordered=False)
+
+def ingest(collection, batches, on_batch=None):
+    docs = 0
+    start_time = time.time()
+    for i, batch in enumerate(batches, start=1):
+        insert_batch(collection, batch)
+        docs += len(batch)
+        if on_batch is not None:
+            on_batch(i)
+    return docs, time.time() - start_time
@@ -0,0 +1,205 @@
+from pymongo import MongoClient
+from pymongo.errors import ConnectionFailure, OperationFailure
+import time
+import threading
+from tabulate import tabulate
+from concurrent.futures import ThreadPoolExecutor
+
+# Topology giống docker-compose.yml, chạy từ một container trong cùng network
+TOPOLOGY = {
+    'config': {
+        '_id': 'rs-config-server',
+        'configsvr': True,
+        'members': ['configsvr01:27017', 'configsvr02:27017', 'configsvr03:27017']
+    },
+    'shards': [
+        {'_id': 'rs-shard-01', 'members': ['shard01-a:27017', 'shard01-b:27017', 'shard01-c:27017']},
+        {'_id': 'rs-shard-02', 'members': ['shard02-a:27017', 'shard02-b:27017', 'shard02-c:27017']},
+        {'_id': 'rs-shard-03', 'members': ['shard03-a:27017', 'shard03-b:27017', 'shard03-c:27017']}
+    ],
+    'router': 'router01:27017',
+    'default_rw_concern': {'w': 'majority', 'wtimeout': 5000},
+    'sharded_collections': {
+        'MyDatabase.MyCollection': {'oemNumber': 'hashed', 'zipCode': 1, 'supplierId': 1}
+    }
+}
+
+# Backoff khi poll: bắt đầu ngắn để phát hiện primary sớm nhất có thể
+INITIAL_BACKOFF = 0.1
+MAX_BACKOFF = 1.0
+TIMEOUT = 120
+
+# Lỗi tạm thời trong lúc replica set đang bầu primary hoặc mongos chưa thấy shard
+RETRYABLE_CODES = {
+    6,      # HostUnreachable
+    7,      # HostNotFound
+    89,     # NetworkTimeout
+    91,     # ShutdownInProgress
+    133,    # FailedToSatisfyReadPreference
+    134,    # ReadConcernMajorityNotAvailableYet
+    189,    # PrimarySteppedDown
+    10107,  # NotWritablePrimary
+    11600,  # InterruptedAtShutdown
+    11602,  # InterruptedDueToReplStateChange
+    13435,  # NotPrimaryNoSecondaryOk
+    13436   # NotPrimaryOrSecondary
+}
+
+ALREADY_INITIALIZED = 23
+
+class Timeline:
+    def __init__(self):
+        self.start_time = time.time()
+        self.events = []
+        self.lock = threading.Lock()
+
+    def record(self, stage, detail):
+        elapsed = round(time.time() - self.start_time, 3)
+        with self.lock:
+            self.events.append({
+                'Elapsed (sec)': elapsed,
+                'Stage': stage,
+                'Detail': detail
+            })
+        print(f"[{elapsed:8.3f}s] {stage}: {detail}")
+
+    def print_table(self):
+        print("\n=== Cluster Startup Timeline ===")
+        print(tabulate(sorted(self.events, key=lambda e: e['Elapsed (sec)']),
+                       headers='keys', tablefmt='grid'))
+
+def connect_direct(host):
+    return MongoClient(host, directConnection=True, serverSelectionTimeoutMS=2000)
+
+def with_backoff(func, description, timeout=TIMEOUT):
+    backoff = INITIAL_BACKOFF
+    deadline = time.time() + timeout
+
+    while True:
+        try:
+            result = func()
+            if result is not None:
+                return result
+        except ConnectionFailure:
+            pass
+        except OperationFailure as e:
+            if e.code not in RETRYABLE_CODES:
+                raise
+
+        if time.time() > deadline:
+            raise TimeoutError(f"Timed out waiting for {description}")
+        time.sleep(backoff)
+        backoff = min(backoff * 1.5, MAX_BACKOFF)
+
+def wait_for_host(client):
+    return with_backoff(lambda: client.admin.command('ping'), 'host')
+
+def initiate_replica_set(client, rs):
+    config = {
+        '_id': rs['_id'],
+        'version': 1,
+        'members': [{'_id': i, 'host': host} for i, host in enumerate(rs['members'])]
+    }
+    if rs.get('configsvr'):
+        config['configsvr'] = True
+
+    try:
+        client.admin.command('replSetInitiate', config)
+        return True
+    except OperationFailure as e:
+        if e.code == ALREADY_INITIALIZED:
+            return False
+        raise
+
+def find_primary(client):
+    hello = client.admin.command('hello')
+    if hello.get('isWritablePrimary') or hello.get('primary'):
+        return hello.get('primary')
+    return None
+
+def member_states(client):
+    status = client.admin.command('replSetGetStatus')
+    return ', '.join(f"{m['name']}={m['stateStr']}" for m in status['members'])
+
+def bootstrap_replica_set(rs, timeline):
+    seed = rs['members'][0]
+    client = connect_direct(seed)
+
+    try:
+        for host in rs['members']:
+            member = connect_direct(host)
+            wait_for_host(member)
+            member.close()
+        timeline.record(rs['_id'], 'all members reachable')
+
+        if initiate_replica_set(client, rs):
+            timeline.record(rs['_id'], f'replSetInitiate sent to {seed}')
+        else:
+            timeline.record(rs['_id'], 'already initialized')
+
+        primary = with_backoff(lambda: find_primary(client), f"{rs['_id']} primary")
+        timeline.record(rs['_id'], f'primary elected: {primary}')
+        timeline.record(rs['_id'], member_states(client))
+        return primary
+    finally:
+        client.close()
+
+def add_shards(router, shards, timeline):
+    # mongos trả lời ping chưa có nghĩa đã thấy primary mới của config server
+    shard_list = with_backoff(lambda: router.admin.command('listShards'), 'listShards')
+    existing = {s['_id'] for s in shard_list['shards']}
+
+    for rs in shards:
+        if rs['_id'] in existing:
+            timeline.record('router', f"{rs['_id']} already added")
+            continue
+
+        connection_string = f"{rs['_id']}/{','.join(rs['members'])}"
+        with_backoff(lambda: router.admin.command('addShard', connection_string),
+                     f"addShard {rs['_id']}")
+        timeline.record('router', f'addShard {connection_string}')
+
+def configure_sharding(router, topology, timeline):
+    rw_concern = topology['default_rw_concern']
+    with_backoff(lambda: router.admin.command('setDefaultRWConcern', 1,
+                                              defaultWriteConcern=rw_concern),
+                 'setDefaultRWConcern')
+    timeline.record('router', f'setDefaultRWConcern {rw_concern}')
+
+    for namespace, key in topology['sharded_collections'].items():
+        database = namespace.split('.', 1)[0]
+        with_backoff(lambda: router.admin.command('enableSharding', database),
+                     f'enableSharding {database}')
+        with_backoff(lambda: router.admin.command('shardCollection', namespace, key=key),
+                     f'shardCollection {namespace}')
+        timeline.record('router', f'shardCollection {namespace} {key}')
+
+def bootstrap_cluster(topology=TOPOLOGY):
+    timeline = Timeline()
+    replica_sets = [topology['config']] + topology['shards']
+
+    # Config server và các shard không phụ thuộc nhau nên initiate song song
+    with ThreadPoolExecutor(max_workers=len(replica_sets)) as executor:
+        futures = [executor.submit(bootstrap_replica_set, rs, timeline) for rs in replica_sets]
+        for future in futures:
+            future.result()
+
+    router = connect_direct(topology['router'])
+    try:
+        wait_for_host(router)
+        timeline.record('router', f"{topology['router']} reachable")
+
+        add_shards(router, topology['shards'], timeline)
+        configure_sharding(router, topology, timeline)
+        timeline.record('cluster', 'ready')
+    finally:
+        router.close()
+
+    return timeline
+
+def main():
+    timeline = bootstrap_cluster()
+    timeline.print_table()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+from pymongo import MongoClient, WriteConcern, UpdateOne, UpdateMany, ReplaceOne
+import random
+import time
+from datetime import datetime
+from tabulate import tabulate
+from mongodb_data_generator import generate_batch_data
+from test_mongodb_order_performance import generate_order_data
+
+# Lưu ý: workload này sửa vĩnh viễn dữ liệu trong MyDatabase (status, totalAmount,
+# products.quantity, updatedAt của OrderCollection; price, quantity của MyCollection),
+# kể cả document ngoài tập sample do UpdateMany. cleanup() chỉ xoá document sinh ra từ
+# upsert, cần import lại dữ liệu nếu muốn so sánh các benchmark query với baseline.
+
+# Chỉ dùng một router để counter trong serverStatus của mongos phản ánh đủ mọi op
+MONGO_URI = 'mongodb://localhost:27117'
+
+# Vòng đời đơn hàng: Pending -> Processing -> Shipped -> Delivered
+NEXT_STATUS = {
+    'Pending': 'Processing',
+    'Processing': 'Shipped',
+    'Shipped': 'Delivered'
+}
+
+# Đánh dấu document sinh ra từ upsert để dọn dẹp sau khi test
+WORKLOAD_TAG = 'bulk-update-workload'
+
+def connect_to_mongodb():
+    try:
+        client = MongoClient(MONGO_URI)
+        client.admin.command('ping')
+        return client
+    except Exception as e:
+        print(f"Connection error: {e}")
+        return None
+
+def get_shard_key(client, coll_name):
+    meta = client['config']['collections'].find_one({'_id': f'MyDatabase.{coll_name}'})
+    if meta is None or meta.get('dropped'):
+        return None
+    return list(meta['key'].keys())
+
+def sample_documents(collection, size):
+    return list(collection.aggregate([{'$sample': {'size': size}}]))
+
+def targeted_filter(doc, shard_key, fallback):
+    # Filter chứa đủ shard key để mongos route tới đúng một shard
+    fields = shard_key if shard_key else fallback
+    return {field: doc.get(field) for field in fields}
+
+def order_operations(doc, samples, shard_key, fresh_docs):
+    targeted = targeted_filter(doc, shard_key, ['orderId'])
+    now = datetime.now()
+    roll = random.random()
+
+    if roll < 0.4 and doc.get('status') in NEXT_STATUS:
+        # Chuyển trạng thái, điều kiện status tránh cập nhật trùng
+        op = UpdateOne({**targeted, 'status': doc['status']},
+                       {'$set': {'status': NEXT_STATUS[doc['status']], 'updatedAt': now}})
+        # Cập nhật bản sample trong bộ nhớ để lần sau chuyển tiếp trạng thái kế tiếp
+        doc['status'] = NEXT_STATUS[doc['status']]
+        return op, True
+    if roll < 0.6:
+        return UpdateOne({'_id': doc['_id']},
+                         {'$inc': {'products.0.quantity': 1},
+                          '$set': {'totalAmount': round(random.uniform(50.0, 5000.0), 2),
+                                   'updatedAt': now}}), False
+    if roll < 0.7:
+        for sample in samples:
+            if sample['customerEmail'] == doc['customerEmail'] and sample['status'] == 'Pending':
+                sample['status'] = 'Processing'
+        return UpdateMany({'customerEmail': doc['customerEmail'], 'status': 'Pending'},
+                          {'$set': {'status': 'Processing', 'updatedAt': now}}), False
+    if roll < 0.85:
+        replacement = {k: v for k, v in doc.items() if k != '_id'}
+        replacement['totalAmount'] = round(random.uniform(50.0, 5000.0), 2)
+        replacement['updatedAt'] = now
+        # Giữ status hiện tại, filter theo status để không bao giờ lùi trạng thái
+        return ReplaceOne({**targeted, 'status': doc['status']}, replacement), True
+
+    new_order = next(fresh_docs)
+    new_order['workload'] = WORKLOAD_TAG
+    upsert_filter = targeted_filter(new_order, shard_key, ['orderId'])
+    return UpdateOne(upsert_filter,
+                     {'$setOnInsert': {k: v for k, v in new_order.items() if k not in upsert_filter}},
+                     upsert=True), True
+
+def product_operations(doc, shard_key, fresh_docs):
+    targeted = targeted_filter(doc, shard_key, ['oemNumber'])
+    roll = random.random()
+
+    if roll < 0.4:
+        # Điều kiện quantity >= 5 để $inc âm không đẩy tồn kho xuống dưới 0
+        return UpdateOne({**targeted, 'quantity': {'$gte': 5}},
+                         {'$inc': {'quantity': random.randint(-5, 5)},
+                          '$set': {'price': round(random.uniform(10.0, 1000.0), 2)}}), True
+    if roll < 0.6:
+        return UpdateOne({'_id': doc['_id']},
+                         {'$set': {'price': round(random.uniform(10.0, 1000.0), 2)}}), False
+    if roll < 0.7:
+        return UpdateMany({'manufacturer': doc['manufacturer']},
+                          {'$inc': {'quantity': 1}}), False
+    if roll < 0.85:
+        replacement = {k: v for k, v in doc.items() if k != '_id'}
+        replacement['quantity'] = random.randint(1, 1000)
+        replacement['price'] = round(random.uniform(10.0, 1000.0), 2)
+        return ReplaceOne(targeted, replacement), True
+
+    new_product = next(fresh_docs)
+    new_product['workload'] = WORKLOAD_TAG
+    upsert_filter = targeted_filter(new_product, shard_key, ['oemNumber'])
+    return UpdateOne(upsert_filter,
+                     {'$setOnInsert': {k: v for k, v in new_product.items() if k not in upsert_filter}},
+                     upsert=True), True
+
+def build_batch(coll_name, samples, batch_size, shard_key, product_ids):
+    operations = []
+    scatter_gather = 0
+
+    # Sinh sẵn document mới cho upsert, tránh khởi tạo Faker cho từng op
+    if coll_name == 'OrderCollection':
+        fresh_docs = iter(generate_order_data(batch_size, product_ids))
+    else:
+        fresh_docs = iter(generate_batch_data(batch_size))
+
+    for doc in random.choices(samples, k=batch_size):
+        if coll_name == 'OrderCollection':
+            op, is_targeted = order_operations(doc, samples, shard_key, fresh_docs)
+        else:
+            op, is_targeted = product_operations(doc, shard_key, fresh_docs)
+        operations.append(op)
+        # Collection chưa shard thì mọi op chỉ tới primary shard
+        if shard_key and not is_targeted:
+            scatter_gather += 1
+
+    return operations, scatter_gather
+
+def non_targeted_counters(client):
+    # mongos 7.0+ đếm updateOne/deleteOne/findAndModify không chứa shard key
+    metrics = client.admin.command('serverStatus')['metrics'].get('query', {})
+    return sum(v for k, v in metrics.items() if k.endswith('NonTargetedShardedCount'))
+
+def percentile(values, p):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def test_bulk_updates(client, coll_name, batch_sizes, write_concerns, num_batches):
+    db = client['MyDatabase']
+    results = []
+
+    shard_key = get_shard_key(client, coll_name)
+    samples = sample_documents(db[coll_name], 1000)
+    if not samples:
+        print(f"No documents found in {coll_name}")
+        return results
+
+    product_ids = list(db['MyCollection'].find({}, {'_id': 1}).limit(1000))
+
+    for batch_size in batch_sizes:
+        for wc in write_concerns:
+            collection = db.get_collection(coll_name, write_concern=WriteConcern(**wc))
+
+            latencies = []
+            total_ops = 0
+            scatter_gather = 0
+            modified = 0
+            upserted = 0
+            errors = 0
+            counters_before = non_targeted_counters(client)
+
+            for _ in range(num_batches):
+                operations, batch_scatter = build_batch(
+                    coll_name, samples, batch_size, shard_key, product_ids
+                )
+
+                start_time = time.time()
+                try:
+                    result = collection.bulk_write(operations, ordered=False)
+                    modified += result.modified_count
+                    upserted += result.upserted_count
+                except Exception as e:
+                    errors += 1
+                    print(f"Bulk write error: {e}")
+                latencies.append(time.time() - start_time)
+
+                total_ops += len(operations)
+                scatter_gather += batch_scatter
+
+            total_time = sum(latencies)
+
+            results.append({
+                'Collection': coll_name,
+                'Batch Size': batch_size,
+                'Write Concern': f"w: {wc['w']}, wtimeout: {wc['wtimeout']}ms",
+                'Ops/sec': round(total_ops / total_time) if total_time else 0,
+                'p50 (sec)': round(percentile(latencies, 50), 4),
+                'p95 (sec)': round(percentile(latencies, 95), 4),
+                'p99 (sec)': round(percentile(latencies, 99), 4),
+                'Modified': modified,
+                'Upserted': upserted,
+                'Scatter-Gather Ops': scatter_gather,
+                'mongos Non-Targeted': non_targeted_counters(client) - counters_before,
+                'Failed Batches': errors
+            })
+
+    return results
+
+def cleanup(client):
+    db = client['MyDatabase']
+    for coll_name in ['OrderCollection', 'MyCollection']:
+        db[coll_name].delete_many({'workload': WORKLOAD_TAG})
+
+def main():
+    batch_sizes = [100, 500, 1000]
+    write_concerns = [
+        {'w': 1, 'wtimeout': 5000},
+        {'w': 'majority', 'wtimeout': 5000}
+    ]
+    NUM_BATCHES = 20
+
+    client = connect_to_mongodb()
+    if client is None:
+        print("Could not connect to MongoDB")
+        return
+
+    try:
+        for coll_name in ['OrderCollection', 'MyCollection']:
+            print(f"\n=== Testing Bulk Updates on {coll_name} ===")
+            results = test_bulk_updates(client, coll_name, batch_sizes, write_concerns, NUM_BATCHES)
+            print(tabulate(results, headers='keys', tablefmt='grid'))
+    finally:
+        cleanup(client)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+from pymongo import MongoClient
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from tabulate import tabulate
+from cluster_bootstrap import bootstrap_cluster
+
+# Số node mỗi replica set khi chạy local, tăng lên 3 để giống docker-compose
+MEMBERS_PER_SET = 1
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def spawn(args, log_path):
+    with open(log_path, 'w') as log:
+        return subprocess.Popen(args, stdout=log, stderr=subprocess.STDOUT)
+
+def spawn_replica_set(base_dir, rs_name, role, processes):
+    members = []
+
+    for i in range(MEMBERS_PER_SET):
+        port = free_port()
+        dbpath = os.path.join(base_dir, f'{rs_name}-{i}')
+        os.makedirs(dbpath)
+        processes.append(spawn([
+            'mongod', role,
+            '--replSet', rs_name,
+            '--port', str(port),
+            '--dbpath', dbpath,
+            '--bind_ip', '127.0.0.1'
+        ], dbpath + '.log'))
+        members.append(f'127.0.0.1:{port}')
+
+    return members
+
+def spawn_local_cluster(base_dir, processes):
+    # Process được thêm vào list của caller ngay khi spawn để luôn được dọn dẹp
+    config_members = spawn_replica_set(base_dir, 'rs-config-server', '--configsvr', processes)
+
+    shards = []
+    for n in range(1, 4):
+        rs_name = f'rs-shard-0{n}'
+        members = spawn_replica_set(base_dir, rs_name, '--shardsvr', processes)
+        shards.append({'_id': rs_name, 'members': members})
+
+    # mongos tự chờ config server, giống router trong docker-compose
+    router_port = free_port()
+    processes.append(spawn([
+        'mongos',
+        '--port', str(router_port),
+        '--configdb', f"rs-config-server/{','.join(config_members)}",
+        '--bind_ip', '127.0.0.1'
+    ], os.path.join(base_dir, 'router.log')))
+
+    topology = {
+        'config': {'_id': 'rs-config-server', 'configsvr': True, 'members': config_members},
+        'shards': shards,
+        'router': f'127.0.0.1:{router_port}',
+        'default_rw_concern': {'w': 'majority', 'wtimeout': 5000},
+        'sharded_collections': {
+            'MyDatabase.MyCollection': {'oemNumber': 'hashed', 'zipCode': 1, 'supplierId': 1}
+        }
+    }
+    return topology
+
+def verify_cluster(topology):
+    client = MongoClient(topology['router'])
+    try:
+        shards = client.admin.command('listShards')['shards']
+        rw_concern = client.admin.command('getDefaultRWConcern')
+        sharded = client['config']['collections'].find_one({'_id': 'MyDatabase.MyCollection'})
+
+        return [
+            {'Check': 'Shards added', 'Result': len(shards) == len(topology['shards'])},
+            {'Check': 'Default write concern',
+             'Result': rw_concern.get('defaultWriteConcern') == topology['default_rw_concern']},
+            {'Check': 'MyCollection sharded', 'Result': sharded is not None}
+        ]
+    finally:
+        client.close()
+
+def main():
+    if shutil.which('mongod') is None or shutil.which('mongos') is None:
+        print("mongod/mongos not found in PATH")
+        return
+
+    base_dir = tempfile.mkdtemp(prefix='mongo-cluster-')
+    processes = []
+    passed = False
+
+    try:
+        topology = spawn_local_cluster(base_dir, processes)
+
+        start_time = time.time()
+        timeline = bootstrap_cluster(topology)
+        timeline.print_table()
+        print(f"Bootstrap time: {round(time.time() - start_time, 2)} seconds")
+
+        print("\n=== Verifying Cluster ===")
+        checks = verify_cluster(topology)
+        print(tabulate(checks, headers='keys', tablefmt='grid'))
+        passed = all(check['Result'] for check in checks)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+    if not passed:
+        print("Cluster verification failed")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
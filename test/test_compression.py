@@ -0,0 +1,206 @@
+from pymongo import MongoClient
+from pymongo.errors import OperationFailure
+import importlib
+import time
+from tabulate import tabulate
+from benchmark_data import generate_dataset, ingest
+from test_mongodb_query_performance import test_simple_queries, test_join_queries
+
+# Chỉ dùng một router để serverStatus.network phản ánh đúng traffic của client
+MONGO_URI = 'mongodb://localhost:27117'
+
+BENCHMARK_DB = 'CompressionBenchmarkDB'
+
+# Module Python mà pymongo cần để dùng từng wire compressor
+WIRE_COMPRESSORS = {
+    'none': None,
+    'snappy': 'snappy',
+    'zlib': 'zlib',
+    'zstd': 'zstandard'
+}
+
+BLOCK_COMPRESSORS = ['none', 'snappy', 'zlib', 'zstd']
+
+PAGE_SIZE = 1000
+
+def compressor_available(name):
+    module = WIRE_COMPRESSORS[name]
+    if module is None:
+        return True
+    try:
+        importlib.import_module(module)
+        return True
+    except ImportError:
+        return False
+
+def connect_to_mongodb(compressor='none'):
+    try:
+        if compressor == 'none':
+            client = MongoClient(MONGO_URI)
+        else:
+            client = MongoClient(MONGO_URI, compressors=compressor)
+        client.admin.command('ping')
+        return client
+    except Exception as e:
+        print(f"Connection error: {e}")
+        return None
+
+def negotiated(client, compressor):
+    # Kiểm tra phía client: counter network.compression của mongos còn tính cả traffic
+    # mongos -> shard (mặc định snappy) nên không chứng minh được client đã nén.
+    # pymongo chỉ gửi compressor khi có module, server trả lại những cái nó chấp nhận
+    if compressor == 'none':
+        return '-'
+    if not compressor_available(compressor):
+        return False
+    try:
+        hello = client.admin.command({'hello': 1, 'compression': [compressor]})
+    except OperationFailure:
+        return 'unverified'
+    return compressor in hello.get('compression', [])
+
+def server_snapshot(client):
+    status = client.admin.command('serverStatus')
+    network = status['network']
+    extra_info = status.get('extra_info', {})
+    return {
+        # bytesIn/bytesOut là số byte logic chưa nén, physical mới là byte thật trên dây
+        'bytes_in': network['physicalBytesIn'],
+        'bytes_out': network['physicalBytesOut'],
+        # user_time_us/system_time_us chỉ có trên Linux
+        'cpu_us': extra_info.get('user_time_us', 0) + extra_info.get('system_time_us', 0)
+    }
+
+def measure(client, workload):
+    before = server_snapshot(client)
+    cpu_start = time.process_time()
+    start_time = time.time()
+
+    workload()
+
+    elapsed = time.time() - start_time
+    client_cpu = time.process_time() - cpu_start
+    after = server_snapshot(client)
+
+    return {
+        'Sent (MB)': round((after['bytes_in'] - before['bytes_in']) / 1024 / 1024, 3),
+        'Received (MB)': round((after['bytes_out'] - before['bytes_out']) / 1024 / 1024, 3),
+        'Client CPU (sec)': round(client_cpu, 4),
+        'mongos CPU (sec)': round((after['cpu_us'] - before['cpu_us']) / 1000000, 4),
+        'Latency (sec)': round(elapsed, 4)
+    }
+
+def warm_up():
+    # Chạy một lần không đo để compressor đầu tiên không bị tính cache nguội
+    client = connect_to_mongodb()
+    if client is None:
+        return
+    try:
+        db = client['MyDatabase']
+        test_simple_queries(db['MyCollection'], [PAGE_SIZE])
+        test_join_queries(db, [PAGE_SIZE])
+    finally:
+        client.close()
+
+def test_wire_compression(dataset):
+    results = []
+    warm_up()
+
+    for compressor in WIRE_COMPRESSORS:
+        if not compressor_available(compressor):
+            print(f"Skipping {compressor}: module {WIRE_COMPRESSORS[compressor]} not installed")
+            continue
+
+        client = connect_to_mongodb(compressor)
+        if client is None:
+            continue
+
+        agreed = negotiated(client, compressor)
+        if agreed is False:
+            print(f"Warning: {compressor} was not negotiated, traffic is uncompressed")
+
+        db = client['MyDatabase']
+        scratch = client[BENCHMARK_DB]
+        scratch.drop_collection('WireIngest')
+
+        workloads = {
+            'Page Queries': lambda: test_simple_queries(db['MyCollection'], [PAGE_SIZE]),
+            'Join Queries': lambda: test_join_queries(db, [PAGE_SIZE]),
+            'Bulk Ingest': lambda: ingest(scratch['WireIngest'], dataset['OrderCollection'])
+        }
+
+        try:
+            for name, workload in workloads.items():
+                results.append({
+                    'Wire Compressor': compressor,
+                    'Workload': name,
+                    'Negotiated': agreed,
+                    **measure(client, workload)
+                })
+        finally:
+            scratch.drop_collection('WireIngest')
+            client.close()
+
+    return results
+
+def test_block_compression(dataset):
+    results = []
+
+    client = connect_to_mongodb()
+    if client is None:
+        return results
+
+    db = client[BENCHMARK_DB]
+
+    try:
+        for block_compressor in BLOCK_COMPRESSORS:
+            for source, batches in dataset.items():
+                coll_name = f'{source}_{block_compressor}'
+                db.drop_collection(coll_name)
+                db.create_collection(coll_name, storageEngine={
+                    'wiredTiger': {'configString': f'block_compressor={block_compressor}'}
+                })
+
+                _, ingest_time = ingest(db[coll_name], batches)
+
+                # Đọc lại một trang 1000 dòng để thấy chi phí giải nén
+                start_time = time.time()
+                list(db[coll_name].find({}).limit(PAGE_SIZE))
+                page_time = time.time() - start_time
+
+                # Flush xuống đĩa trước, không thì storageSize chưa gồm dữ liệu chưa checkpoint
+                client.admin.command('fsync')
+                stats = next(db[coll_name].aggregate([{'$collStats': {'storageStats': {}}}]))['storageStats']
+
+                results.append({
+                    'Block Compressor': block_compressor,
+                    'Collection': source,
+                    'Data Size (MB)': round(stats['size'] / 1024 / 1024, 2),
+                    'On-disk Size (MB)': round(stats['storageSize'] / 1024 / 1024, 2),
+                    'Ratio': round(stats['size'] / stats['storageSize'], 2) if stats['storageSize'] else 0,
+                    'Ingest Time (sec)': round(ingest_time, 4),
+                    'Page Read (sec)': round(page_time, 4)
+                })
+    finally:
+        client.drop_database(BENCHMARK_DB)
+        client.close()
+
+    return results
+
+def main():
+    NUM_RECORDS = 50000
+    BATCH_SIZE = 1000
+
+    print("Generating dataset...")
+    dataset = generate_dataset(NUM_RECORDS, BATCH_SIZE)
+
+    print("\n=== Testing Wire Compression ===")
+    wire_results = test_wire_compression(dataset)
+    print(tabulate(wire_results, headers='keys', tablefmt='grid'))
+
+    print("\n=== Testing Block Compression ===")
+    block_results = test_block_compression(dataset)
+    print(tabulate(block_results, headers='keys', tablefmt='grid'))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+from pymongo import MongoClient
+import time
+import threading
+from tabulate import tabulate
+from concurrent.futures import ThreadPoolExecutor
+from benchmark_data import generate_dataset, ingest
+from test_mongodb_query_performance import MY_COLLECTION_INDEXES, ORDER_COLLECTION_INDEXES
+
+MONGO_URI = 'mongodb://localhost:27117,localhost:27118'
+
+BENCHMARK_DB = 'IndexBenchmarkDB'
+
+COLLECTIONS = {
+    'MyCollection': {
+        'indexes': MY_COLLECTION_INDEXES,
+        'shard_key': {'oemNumber': 'hashed', 'zipCode': 1, 'supplierId': 1}
+    },
+    # Giống cluster thật (RUN.md): OrderCollection không được shard
+    'OrderCollection': {
+        'indexes': ORDER_COLLECTION_INDEXES,
+        'shard_key': None
+    }
+}
+
+STRATEGIES = ['Pre-load', 'Post-load', 'Concurrent']
+
+# Concurrent strategy bắt đầu build index khi đã ingest được tỉ lệ này
+CONCURRENT_BUILD_AFTER = 0.5
+
+# Chu kỳ poll $currentOp để đo thời gian build index trên từng shard
+POLL_INTERVAL = 0.05
+
+def connect_to_mongodb():
+    try:
+        client = MongoClient(MONGO_URI)
+        client.admin.command('ping')
+        return client
+    except Exception as e:
+        print(f"Connection error: {e}")
+        return None
+
+def secondary_indexes(indexes):
+    # Index _id luôn tồn tại sẵn, tạo lại với tên khác sẽ bị server từ chối
+    return [index for index in indexes if list(index.document['key'].keys()) != ['_id']]
+
+def prepare_collection(client, coll_name, shard_key):
+    db = client[BENCHMARK_DB]
+    db.drop_collection(coll_name)
+
+    if shard_key is None:
+        return db[coll_name], False
+
+    try:
+        client.admin.command('enableSharding', BENCHMARK_DB)
+        client.admin.command('shardCollection', f'{BENCHMARK_DB}.{coll_name}', key=shard_key)
+        return db[coll_name], True
+    except Exception as e:
+        print(f"Sharding error ({coll_name}), continuing unsharded: {e}")
+        return db[coll_name], False
+
+def concurrent_ingest(collection, batches, started_event):
+    trigger_at = max(1, int(len(batches) * CONCURRENT_BUILD_AFTER))
+
+    def on_batch(i):
+        if i == trigger_at:
+            started_event.set()
+
+    try:
+        return ingest(collection, batches, on_batch)
+    finally:
+        # Không để thread chính chờ mãi nếu ingest lỗi
+        started_event.set()
+
+def watch_index_builds(client, coll_name, stop_event, durations):
+    pipeline = [
+        {'$currentOp': {'allUsers': True}},
+        {'$match': {
+            'command.createIndexes': coll_name,
+            'ns': {'$regex': f'^{BENCHMARK_DB}\\.'}
+        }}
+    ]
+
+    while not stop_event.is_set():
+        try:
+            for op in client.admin.aggregate(pipeline):
+                shard = op.get('shard', 'unsharded')
+                secs = op.get('microsecs_running', 0) / 1000000
+                durations[shard] = max(durations.get(shard, 0), secs)
+        except Exception as e:
+            print(f"currentOp error: {e}")
+            return
+        stop_event.wait(POLL_INTERVAL)
+
+def build_indexes(client, collection, indexes):
+    durations = {}
+    stop_event = threading.Event()
+    watcher = threading.Thread(
+        target=watch_index_builds,
+        args=(client, collection.name, stop_event, durations)
+    )
+    watcher.start()
+
+    start_time = time.time()
+    try:
+        collection.create_indexes(indexes)
+    finally:
+        build_time = time.time() - start_time
+        stop_event.set()
+        watcher.join()
+
+    return build_time, durations
+
+def get_index_sizes(client, collection):
+    # Flush xuống đĩa trước, không thì totalIndexSize chưa gồm phần chưa checkpoint
+    client.admin.command('fsync')
+    sizes = {}
+    for stats in collection.aggregate([{'$collStats': {'storageStats': {}}}]):
+        shard = stats.get('shard', 'unsharded')
+        sizes[shard] = stats['storageStats']['totalIndexSize']
+    return sizes
+
+def run_strategy(client, strategy, coll_name, batches):
+    spec = COLLECTIONS[coll_name]
+    indexes = secondary_indexes(spec['indexes'])
+    collection, sharded = prepare_collection(client, coll_name, spec['shard_key'])
+
+    start_time = time.time()
+
+    if strategy == 'Pre-load':
+        build_time, durations = build_indexes(client, collection, indexes)
+        docs, ingest_time = ingest(collection, batches)
+    elif strategy == 'Post-load':
+        docs, ingest_time = ingest(collection, batches)
+        build_time, durations = build_indexes(client, collection, indexes)
+    else:
+        started_event = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(concurrent_ingest, collection, batches, started_event)
+            started_event.wait()
+            build_time, durations = build_indexes(client, collection, indexes)
+            docs, ingest_time = future.result()
+
+    total_time = time.time() - start_time
+    sizes = get_index_sizes(client, collection)
+
+    summary = {
+        'Strategy': strategy,
+        'Collection': coll_name,
+        'Sharded': sharded,
+        'Documents': docs,
+        'Ingest (docs/sec)': round(docs / ingest_time) if ingest_time else 0,
+        'Ingest Time (sec)': round(ingest_time, 4),
+        'Index Build Time (sec)': round(build_time, 4),
+        'Total Wall Time (sec)': round(total_time, 4),
+        'Index Size (MB)': round(sum(sizes.values()) / 1024 / 1024, 2)
+    }
+
+    shard_rows = [{
+        'Strategy': strategy,
+        'Collection': coll_name,
+        'Shard': shard,
+        # Build quá nhanh có thể lọt giữa hai lần poll
+        'Index Build (sec)': round(durations[shard], 4) if shard in durations else '-',
+        'Index Size (MB)': round(sizes.get(shard, 0) / 1024 / 1024, 2)
+    } for shard in sorted(set(sizes) | set(durations))]
+
+    return summary, shard_rows
+
+def main():
+    NUM_RECORDS = 100000
+    BATCH_SIZE = 1000
+
+    client = connect_to_mongodb()
+    if client is None:
+        print("Could not connect to MongoDB")
+        return
+
+    print("Generating dataset...")
+    dataset = generate_dataset(NUM_RECORDS, BATCH_SIZE)
+
+    summary_results = []
+    shard_results = []
+
+    for coll_name, batches in dataset.items():
+        for strategy in STRATEGIES:
+            print(f"Running {strategy} on {coll_name}...")
+            summary, shard_rows = run_strategy(client, strategy, coll_name, batches)
+            summary_results.append(summary)
+            shard_results.extend(shard_rows)
+
+    client.drop_database(BENCHMARK_DB)
+
+    print("\n=== Index Build Strategy Summary ===")
+    print(tabulate(summary_results, headers='keys', tablefmt='grid'))
+
+    print("\n=== Index Build Per Shard ===")
+    print(tabulate(shard_results, headers='keys', tablefmt='grid'))
+
+if __name__ == "__main__":
+    main()
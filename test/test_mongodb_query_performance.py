@@ -210,35 +210,38 @@ def test_join_queries(db, page_sizes: List[int]) -> List[Dict]:
     
     return results
 
+# Indexes cho MyCollection
+MY_COLLECTION_INDEXES = [
+    # Index cho price và category - hỗ trợ sort và filter
+    pymongo.IndexModel([("price", -1)]),
+    pymongo.IndexModel([("category", 1), ("price", -1)]),
+    # Index cho manufacturer - hỗ trợ sort
+    pymongo.IndexModel([("manufacturer", 1)]),
+    # Index cho _id vì nó được dùng trong join
+    pymongo.IndexModel([("_id", 1)])
+]
+
+# Indexes cho OrderCollection
+ORDER_COLLECTION_INDEXES = [
+    # Index cho orderDate - hỗ trợ filter date range
+    pymongo.IndexModel([("orderDate", -1)]),
+    # Index cho status và totalAmount - hỗ trợ filter
+    pymongo.IndexModel([("status", 1), ("totalAmount", 1)]),
+    # Index cho products.productId - hỗ trợ join
+    pymongo.IndexModel([("products.productId", 1)]),
+    # Compound index cho sort phức hợp
+    pymongo.IndexModel([
+        ("products.productId", 1),
+        ("totalAmount", -1)
+    ])
+]
+
 def create_indexes(db):
     print("Creating indexes...")
     
-    # Indexes cho MyCollection
     try:
-        db['MyCollection'].create_indexes([
-            # Index cho price và category - hỗ trợ sort và filter
-            pymongo.IndexModel([("price", -1)]),
-            pymongo.IndexModel([("category", 1), ("price", -1)]),
-            # Index cho manufacturer - hỗ trợ sort
-            pymongo.IndexModel([("manufacturer", 1)]),
-            # Index cho _id vì nó được dùng trong join
-            pymongo.IndexModel([("_id", 1)])
-        ])
-        
-        # Indexes cho OrderCollection
-        db['OrderCollection'].create_indexes([
-            # Index cho orderDate - hỗ trợ filter date range
-            pymongo.IndexModel([("orderDate", -1)]),
-            # Index cho status và totalAmount - hỗ trợ filter
-            pymongo.IndexModel([("status", 1), ("totalAmount", 1)]),
-            # Index cho products.productId - hỗ trợ join
-            pymongo.IndexModel([("products.productId", 1)]),
-            # Compound index cho sort phức hợp
-            pymongo.IndexModel([
-                ("products.productId", 1),
-                ("totalAmount", -1)
-            ])
-        ])
+        db['MyCollection'].create_indexes(MY_COLLECTION_INDEXES)
+        db['OrderCollection'].create_indexes(ORDER_COLLECTION_INDEXES)
         print("Indexes created successfully")
     except Exception as e:
         print(f"Error creating indexes: {e}")
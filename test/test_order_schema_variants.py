@@ -0,0 +1,213 @@
+from pymongo import MongoClient, UpdateOne
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from bson import ObjectId
+from faker import Faker
+from tabulate import tabulate
+from benchmark_data import insert_batch
+from test_mongodb_order_performance import generate_order_data
+from test_mongodb_query_performance import ORDER_COLLECTION_INDEXES
+
+MONGO_URI = 'mongodb://localhost:27117,localhost:27118'
+
+BENCHMARK_DB = 'SchemaBenchmarkDB'
+
+VARIANTS = {
+    'Document per order': 'OrderDocument',
+    'Time-series': 'OrderTimeSeries',
+    'Customer/month bucket': 'OrderBucket'
+}
+
+# Số đơn mục tiêu trong mỗi bucket customer/month, dùng để tính số khách hàng
+ORDERS_PER_BUCKET = 20
+
+# generate_order_data rải orderDate trong 365 ngày gần nhất
+MONTHS_SPAN = 12
+
+QUERY_RUNS = 5
+
+def connect_to_mongodb():
+    try:
+        client = MongoClient(MONGO_URI)
+        client.admin.command('ping')
+        return client
+    except Exception as e:
+        print(f"Connection error: {e}")
+        return None
+
+def generate_dataset(num_records, batch_size):
+    fake = Faker(['en_US'])
+    num_customers = max(1, num_records // (MONTHS_SPAN * ORDERS_PER_BUCKET))
+    customers = [(fake.name(), fake.email()) for _ in range(num_customers)]
+    product_ids = [{'_id': ObjectId()} for _ in range(1000)]
+
+    batches = []
+    for _ in range(max(1, num_records // batch_size)):
+        batch = generate_order_data(batch_size, product_ids)
+        for order in batch:
+            order['customerName'], order['customerEmail'] = random.choice(customers)
+        batches.append(batch)
+    return batches
+
+def order_month(order_date):
+    return datetime(order_date.year, order_date.month, 1)
+
+def prepare_collections(db):
+    for coll_name in VARIANTS.values():
+        db.drop_collection(coll_name)
+
+    db['OrderDocument'].create_indexes(ORDER_COLLECTION_INDEXES)
+
+    db.create_collection('OrderTimeSeries', timeseries={
+        'timeField': 'orderDate',
+        'metaField': 'status',
+        'granularity': 'hours'
+    })
+
+    db['OrderBucket'].create_index([('customerEmail', 1), ('month', 1)], unique=True)
+    db['OrderBucket'].create_index([('month', -1)])
+
+def insert_buckets(collection, batch):
+    buckets = defaultdict(list)
+    for order in batch:
+        # customerEmail/customerName đã lưu ở cấp bucket, không lặp lại trong từng order
+        embedded = {k: v for k, v in order.items() if k not in ('customerEmail', 'customerName')}
+        key = (order['customerEmail'], order['customerName'], order_month(order['orderDate']))
+        buckets[key].append(embedded)
+
+    collection.bulk_write([
+        UpdateOne(
+            {'customerEmail': email, 'month': month},
+            {
+                '$setOnInsert': {'customerName': name},
+                '$push': {'orders': {'$each': orders}},
+                '$inc': {
+                    'orderCount': len(orders),
+                    'totalAmount': sum(o['totalAmount'] for o in orders)
+                }
+            },
+            upsert=True
+        ) for (email, name, month), orders in buckets.items()
+    ], ordered=False)
+
+def ingest(db, variant, batches):
+    coll_name = VARIANTS[variant]
+    insert = insert_buckets if variant == 'Customer/month bucket' else insert_batch
+
+    docs = 0
+    start_time = time.time()
+    for batch in batches:
+        insert(db[coll_name], batch)
+        docs += len(batch)
+    return docs, time.time() - start_time
+
+def date_window_pipeline(variant, cutoff):
+    if variant == 'Customer/month bucket':
+        return [
+            {'$match': {'month': {'$gte': order_month(cutoff)}}},
+            {'$unwind': '$orders'},
+            {'$replaceRoot': {'newRoot': '$orders'}},
+            {'$match': {'orderDate': {'$gte': cutoff}}},
+            {'$sort': {'orderDate': -1}},
+            {'$limit': 1000}
+        ]
+    return [
+        {'$match': {'orderDate': {'$gte': cutoff}}},
+        {'$sort': {'orderDate': -1}},
+        {'$limit': 1000}
+    ]
+
+def group_by_status_pipeline(variant):
+    group = {'$group': {
+        '_id': '$status',
+        'order_count': {'$sum': 1},
+        'total_amount': {'$sum': '$totalAmount'},
+        'avg_order_value': {'$avg': '$totalAmount'}
+    }}
+    if variant == 'Customer/month bucket':
+        return [
+            {'$unwind': '$orders'},
+            {'$replaceRoot': {'newRoot': '$orders'}},
+            group
+        ]
+    return [group]
+
+def time_query(collection, pipeline):
+    total_time = 0
+    for _ in range(QUERY_RUNS):
+        start_time = time.time()
+        result = list(collection.aggregate(pipeline))
+        total_time += time.time() - start_time
+    return total_time / QUERY_RUNS, len(result)
+
+def get_storage_sizes(collection):
+    # Flush dữ liệu vừa ingest xuống đĩa, không thì storageSize chưa tính phần chưa checkpoint
+    collection.database.client.admin.command('fsync')
+    stats = next(collection.aggregate([{'$collStats': {'storageStats': {}}}]))['storageStats']
+    return stats, stats['storageSize'], stats.get('totalIndexSize', 0)
+
+def test_schema_variants(db, batches):
+    results = []
+    cutoff = datetime.now() - timedelta(days=30)
+
+    for variant, coll_name in VARIANTS.items():
+        print(f"Loading {variant}...")
+        docs, ingest_time = ingest(db, variant, batches)
+
+        collection = db[coll_name]
+        window_time, window_count = time_query(collection, date_window_pipeline(variant, cutoff))
+        group_time, _ = time_query(collection, group_by_status_pipeline(variant))
+        stats, storage_size, index_size = get_storage_sizes(collection)
+
+        # Time-series lưu theo bucket nội bộ nên báo riêng với số document thường
+        if 'timeseries' in stats:
+            stored_docs = '-'
+            ts_buckets = buckets = stats['timeseries'].get('bucketCount', 0)
+        else:
+            stored_docs = stats.get('count', 0)
+            ts_buckets = '-'
+            buckets = stored_docs if variant == 'Customer/month bucket' else 0
+
+        results.append({
+            'Variant': variant,
+            'Orders': docs,
+            'Stored Documents': stored_docs,
+            'Time-series Buckets': ts_buckets,
+            'Avg Orders/Bucket': round(docs / buckets, 1) if buckets else '-',
+            'Ingest (orders/sec)': round(docs / ingest_time) if ingest_time else 0,
+            'Storage Size (MB)': round(storage_size / 1024 / 1024, 2),
+            'Index Size (MB)': round(index_size / 1024 / 1024, 2),
+            '30-day Window (sec)': round(window_time, 4),
+            'Window Rows': window_count,
+            'Group By Status (sec)': round(group_time, 4)
+        })
+
+    return results
+
+def main():
+    NUM_RECORDS = 100000
+    BATCH_SIZE = 1000
+
+    client = connect_to_mongodb()
+    if client is None:
+        print("Could not connect to MongoDB")
+        return
+
+    db = client[BENCHMARK_DB]
+
+    print("Generating dataset...")
+    batches = generate_dataset(NUM_RECORDS, BATCH_SIZE)
+
+    try:
+        prepare_collections(db)
+        results = test_schema_variants(db, batches)
+
+        print("\n=== Order Schema Variants ===")
+        print(tabulate(results, headers='keys', tablefmt='grid'))
+    finally:
+        client.drop_database(BENCHMARK_DB)
+
+if __name__ == "__main__":
+    main()